@@ -1,4 +1,5 @@
 import argparse
+import json
 import sys
 
 
@@ -31,18 +32,80 @@ def run_torch_fidelity(gen_dir: str, gt_dir: str):
     return 0
 
 
+def load_manifest(path: str):
+    """
+    读取 jsonl 清单，每行形如 {"pair_id": ..., "pred_dir": ..., "gt_dir": ...}。
+    """
+    pairs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for idx, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            pairs.append((str(item.get("pair_id", idx)), item["pred_dir"], item["gt_dir"]))
+    return pairs
+
+
+def run_clean_fid_manifest(pairs):
+    try:
+        from cleanfid import fid as cleanfid_fid
+    except Exception as e:
+        raise ImportError(
+            "clean-fid backend requires clean-fid. Install with: pip install clean-fid"
+        ) from e
+
+    # Inception 只加载一次，所有 pair 共用
+    feat_model = cleanfid_fid.build_feature_extractor("clean")
+    for pair_id, gen_dir, gt_dir in pairs:
+        score = float(cleanfid_fid.compute_fid(gen_dir, gt_dir, custom_feat_extractor=feat_model))
+        print(f"FID (clean-fid) [{pair_id}] = {score:.6f}")
+    return 0
+
+
+def run_torch_fidelity_manifest(pairs):
+    try:
+        from torch_fidelity import calculate_metrics
+    except Exception as e:
+        raise ImportError(
+            "torch-fidelity backend requires torch-fidelity. Install with: pip install torch-fidelity"
+        ) from e
+
+    for pair_id, gen_dir, gt_dir in pairs:
+        metrics = calculate_metrics(input1=gen_dir, input2=gt_dir, fid=True)
+        fid = metrics.get("frechet_inception_distance")
+        if fid is None:
+            raise RuntimeError(f"Unexpected torch-fidelity output keys: {list(metrics.keys())}")
+        print(f"FID [{pair_id}] = {float(fid):.6f}")
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description="Compute FID between two frame directories.")
-    parser.add_argument("gen_dir", help="Generated frames directory")
-    parser.add_argument("gt_dir", help="GT frames directory")
+    parser.add_argument("gen_dir", nargs="?", help="Generated frames directory")
+    parser.add_argument("gt_dir", nargs="?", help="GT frames directory")
     parser.add_argument(
         "--backend",
         default="clean-fid",
         choices=["clean-fid", "torch-fidelity"],
         help="FID backend (recommended: clean-fid)",
     )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="jsonl file with one {pair_id, pred_dir, gt_dir} per line; evaluates all pairs in one process",
+    )
     args = parser.parse_args()
 
+    if args.manifest:
+        pairs = load_manifest(args.manifest)
+        if args.backend == "clean-fid":
+            return run_clean_fid_manifest(pairs)
+        return run_torch_fidelity_manifest(pairs)
+
+    if not args.gen_dir or not args.gt_dir:
+        parser.error("gen_dir and gt_dir are required unless --manifest is given")
+
     if args.backend == "clean-fid":
         return run_clean_fid(args.gen_dir, args.gt_dir)
     return run_torch_fidelity(args.gen_dir, args.gt_dir)
@@ -1,17 +1,59 @@
 import argparse
 import glob
+import json
 import os
 import numpy as np
 import torch
 from PIL import Image
 from tqdm import tqdm
 
+def list_images(frames_dir):
+    extensions = ['*.png', '*.jpg', '*.jpeg', '*.PNG', '*.JPG', '*.JPEG']
+    img_paths = []
+    for ext in extensions:
+        img_paths.extend(glob.glob(os.path.join(frames_dir, ext)))
+    return sorted(img_paths)
+
+def score_images(niqe_metric, img_paths, device):
+    scores = []
+    for img_path in tqdm(img_paths):
+        try:
+            # 读取图片并转换为 Tensor (1, C, H, W), 范围 [0, 1]
+            img = Image.open(img_path).convert('RGB')
+            img_np = np.array(img).astype(np.float32) / 255.0
+            img_tensor = torch.from_numpy(img_np).permute(2, 0, 1).unsqueeze(0).to(device)
+            
+            with torch.no_grad():
+                score = niqe_metric(img_tensor)
+                scores.append(score.item())
+        except Exception as e:
+            print(f"处理图片 {img_path} 时出错: {e}")
+    return scores
+
+def load_manifest(path):
+    """
+    读取 jsonl 清单，每行形如 {"pair_id": ..., "pred_dir": ...}（其余字段忽略）
+    """
+    items = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for idx, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            items.append((str(item.get('pair_id', idx)), item['pred_dir']))
+    return items
+
 def main():
     parser = argparse.ArgumentParser(description="Calculate NIQE score using pyiqa")
-    parser.add_argument("frames_dir", type=str, help="Directory containing the frames (png/jpg)")
+    parser.add_argument("frames_dir", type=str, nargs="?", help="Directory containing the frames (png/jpg)")
     parser.add_argument("--device", type=str, default="cuda" if torch.cuda.is_available() else "cpu", help="Device to use")
+    parser.add_argument("--manifest", type=str, default=None, help="jsonl file with one {pair_id, pred_dir} per line; scores all dirs with one model load")
     args = parser.parse_args()
 
+    if not args.manifest and not args.frames_dir:
+        parser.error("frames_dir is required unless --manifest is given")
+
     # 检查 pyiqa 是否安装
     try:
         import pyiqa
@@ -20,21 +62,27 @@ def main():
         print("请运行以下命令安装: pip install pyiqa")
         return
 
+    if args.manifest:
+        items = load_manifest(args.manifest)
+    else:
+        items = [(None, args.frames_dir)]
+
     # 获取图片列表
-    extensions = ['*.png', '*.jpg', '*.jpeg', '*.PNG', '*.JPG', '*.JPEG']
-    img_paths = []
-    for ext in extensions:
-        img_paths.extend(glob.glob(os.path.join(args.frames_dir, ext)))
-    
-    img_paths = sorted(img_paths)
-    if not img_paths:
-        print(f"在目录 {args.frames_dir} 中未找到图片。")
+    dir_images = []
+    for pair_id, frames_dir in items:
+        img_paths = list_images(frames_dir)
+        if not img_paths:
+            print(f"在目录 {frames_dir} 中未找到图片。")
+            continue
+        dir_images.append((pair_id, img_paths))
+    if not dir_images:
         return
 
-    print(f"找到 {len(img_paths)} 张图片。正在加载 NIQE 模型...")
+    total = sum(len(paths) for _, paths in dir_images)
+    print(f"找到 {total} 张图片。正在加载 NIQE 模型...")
 
     # 初始化 NIQE 指标
-    # pyiqa 会自动处理模型权重的下载和加载
+    # pyiqa 会自动处理模型权重的下载和加载；清单模式下所有目录共用同一个模型
     try:
         # as_loss=False 表示返回原始分数（通常越低越好）
         niqe_metric = pyiqa.create_metric('niqe', device=args.device, as_loss=False)
@@ -43,27 +91,16 @@ def main():
         print("可能是网络问题导致无法下载模型权重，或者 pyiqa 版本不兼容。")
         return
 
-    scores = []
     print(f"开始评估 (使用设备: {args.device})...")
-    
-    for img_path in tqdm(img_paths):
-        try:
-            # 读取图片并转换为 Tensor (1, C, H, W), 范围 [0, 1]
-            img = Image.open(img_path).convert('RGB')
-            img_np = np.array(img).astype(np.float32) / 255.0
-            img_tensor = torch.from_numpy(img_np).permute(2, 0, 1).unsqueeze(0).to(args.device)
-            
-            with torch.no_grad():
-                score = niqe_metric(img_tensor)
-                scores.append(score.item())
-        except Exception as e:
-            print(f"处理图片 {img_path} 时出错: {e}")
 
-    if scores:
-        mean_score = np.mean(scores)
-        print(f"\nNIQE (pyiqa) = {mean_score:.6f} (N={len(scores)})")
-    else:
-        print("未能计算任何图片的 NIQE 分数。")
+    for pair_id, img_paths in dir_images:
+        scores = score_images(niqe_metric, img_paths, args.device)
+        tag = f" [{pair_id}]" if pair_id is not None else ""
+        if scores:
+            mean_score = np.mean(scores)
+            print(f"\nNIQE (pyiqa){tag} = {mean_score:.6f} (N={len(scores)})")
+        else:
+            print(f"未能计算任何图片的 NIQE 分数{tag}。")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,49 @@
 import argparse
+import asyncio
+import codecs
+import functools
+import hashlib
+import io
 import json
+import locale
+import mmap
 import os
 import shutil
+import signal
 import subprocess
 import sys
 import tempfile
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+# 从各评测脚本输出中解析指标数值的正则（模块加载时编译一次）
+_RE_PSNR = re.compile(r"PSNR\s*=\s*([0-9.+\-eE]+)")
+_RE_SSIM = re.compile(r"SSIM\s*=\s*([0-9.+\-eE]+)")
+_RE_LPIPS = re.compile(r"LPIPS.*?=\s*([0-9.+\-eE]+)")
+_RE_NIQE = re.compile(r"NIQE\s*\(pyiqa\)\s*=\s*([0-9.+\-eE]+)")
+_RE_FID = re.compile(r"FID.*?=\s*([0-9.+\-eE]+)")
+_RE_LSE_C = re.compile(r"LSE-C.*?=\s*([0-9.+\-eE]+)")
+_RE_LSE_D = re.compile(r"LSE-D.*?=\s*([0-9.+\-eE]+)")
+# --pairs-file 批量模式下，评测脚本按 "[pair_id] = 数值" 逐行输出
+_RE_NIQE_PAIR = re.compile(r"^NIQE\s*\(pyiqa\)\s*\[([^\]\n]+)\]\s*=\s*([0-9.+\-eE]+)", re.M)
+_RE_FID_PAIR = re.compile(r"^FID[^\[\n]*\[([^\]\n]+)\]\s*=\s*([0-9.+\-eE]+)", re.M)
+# 同上，用于直接在 mmap 的字节内容上查找（无需整体解码为 str）
+_RE_LSE_C_BYTES = re.compile(rb"LSE-C.*?=\s*([0-9.+\-eE]+)")
+_RE_LSE_D_BYTES = re.compile(rb"LSE-D.*?=\s*([0-9.+\-eE]+)")
+
+# 读取子进程输出管道时的缓冲区大小
+_PIPE_CHUNK = 1 << 16
+# 取消阶段时先 SIGTERM，留给子进程清理临时文件的时间（秒），超时后再 SIGKILL
+_TERM_GRACE_SEC = 5.0
+
+# 项目根目录（TalkingGaussian/）及各评测脚本路径，模块加载时计算一次
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_EVAL_DIR = os.path.join(_ROOT, "evaluation")
+_FRAME_SCRIPT = os.path.join(_EVAL_DIR, "eval_frame_metrics.py")
+_NIQE_SCRIPT = os.path.join(_EVAL_DIR, "eval_niqe.py")
+_FID_SCRIPT = os.path.join(_EVAL_DIR, "eval_fid.py")
+_LSE_SCRIPT = os.path.join(_EVAL_DIR, "eval_lse.py")
+_SETUP_LSE_SCRIPT = os.path.join(_EVAL_DIR, "setup_lse.sh")
 
 
 def _run(cmd, cwd=None, allow_fail=False):
@@ -17,43 +55,528 @@ def _run(cmd, cwd=None, allow_fail=False):
     return ret
 
 
-def _run_with_output(cmd, cwd=None, allow_fail=False):
+def _tee_chunk(data, decoder, sink, buf, final=False):
+    text = decoder.decode(data, final=final)
+    if text:
+        sink.write(text)
+        sink.flush()
+        if buf is not None:
+            buf.write(text)
+
+
+async def _tee_stream(stream, sink, buf):
+    decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors="replace")
+    while True:
+        data = await stream.read(_PIPE_CHUNK)
+        if not data:
+            break
+        _tee_chunk(data, decoder, sink, buf)
+    _tee_chunk(b"", decoder, sink, buf, final=True)
+
+
+def _signal_group(pgid, sig):
+    """向进程组发送信号；进程组中已没有进程时返回 False。"""
+    try:
+        os.killpg(pgid, sig)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def _terminate_process(proc):
+    """
+    终止被取消阶段的子进程。POSIX 下对整个进程组先发 SIGTERM，让 conda run / SyncNet
+    等包装进程有机会清理临时目录；_TERM_GRACE_SEC 内仍未全部退出（或等待期间再次被取消）时 SIGKILL。
+    """
+    if os.name == "nt":
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+        await proc.wait()
+        return
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _TERM_GRACE_SEC
+    alive = _signal_group(proc.pid, signal.SIGTERM)
+    try:
+        while alive and loop.time() < deadline:
+            if proc.returncode is None:
+                try:
+                    await asyncio.wait_for(proc.wait(), timeout=0.1)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(0.1)
+            alive = _signal_group(proc.pid, 0)
+    finally:
+        if alive:
+            _signal_group(proc.pid, signal.SIGKILL)
+    await proc.wait()
+
+
+async def _run_async(cmd, cwd=None, allow_fail=False):
     """
     运行子进程并捕获输出，用于从外部脚本中解析指标数值。
+    stdout/stderr 会实时转写到当前终端，同时累积 stdout 供解析。
+    失败且 allow_fail=False 时抛出 CalledProcessError；被取消时会终止子进程（见 _terminate_process）。
     """
     printable = cmd if isinstance(cmd, str) else " ".join(cmd)
     print(f"\n[RUN] {printable}")
-    proc = subprocess.run(
-        cmd,
-        cwd=cwd,
-        shell=isinstance(cmd, str),
-        text=True,
-        capture_output=True,
-    )
-    if proc.stdout:
-        print(proc.stdout)
-    if proc.stderr:
-        print(proc.stderr, file=sys.stderr)
-    if proc.returncode != 0 and not allow_fail:
-        raise SystemExit(proc.returncode)
-    return proc.returncode, proc.stdout or ""
+    pipes = dict(cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, limit=_PIPE_CHUNK)
+    if os.name != "nt":
+        # 独立进程组：取消时连同 conda run / shell 派生的子进程一起终止
+        pipes["start_new_session"] = True
+    if isinstance(cmd, str):
+        proc = await asyncio.create_subprocess_shell(cmd, **pipes)
+    else:
+        proc = await asyncio.create_subprocess_exec(*cmd, **pipes)
+
+    out_buf = io.StringIO()
+    try:
+        await asyncio.gather(
+            _tee_stream(proc.stdout, sys.stdout, out_buf),
+            _tee_stream(proc.stderr, sys.stderr, None),
+        )
+        returncode = await proc.wait()
+    except asyncio.CancelledError:
+        await _terminate_process(proc)
+        raise
+    if returncode != 0 and not allow_fail:
+        raise subprocess.CalledProcessError(returncode, printable)
+    return returncode, out_buf.getvalue()
 
 
-def _project_root() -> str:
-    return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# 收到后需终止各阶段子进程的信号（子进程在独立进程组中，不会随本进程组一起收到）
+_STOP_SIGNALS = tuple(
+    getattr(signal, name) for name in ("SIGINT", "SIGTERM", "SIGHUP") if hasattr(signal, name)
+)
+
+
+async def _run_stages(stages, serial=False):
+    """
+    执行各指标阶段（协程）：serial 时依次执行，否则在同一个事件循环中并发执行，
+    任一阶段失败时取消其余阶段（连带终止其子进程）。
+    收到 SIGINT/SIGTERM/SIGHUP 时同样取消所有阶段，并以 128+信号值 退出。
+    """
+    if not stages:
+        return {}
+
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+    received = []
+
+    def _on_signal(signum):
+        received.append(signum)
+        main_task.cancel()
+
+    installed = []
+    if os.name != "nt":
+        for signum in _STOP_SIGNALS:
+            loop.add_signal_handler(signum, _on_signal, signum)
+            installed.append(signum)
+
+    tasks = []
+    try:
+        if serial:
+            results = {}
+            for name, make in stages:
+                results[name] = await make()
+            return results
+
+        tasks = [asyncio.ensure_future(make()) for _, make in stages]
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+        return {name: task.result() for (name, _), task in zip(stages, tasks)}
+    except asyncio.CancelledError:
+        if not received:
+            raise
+        print(f"\n[ABORT] received signal {received[0]}, stopping all stages", file=sys.stderr)
+        raise SystemExit(128 + received[0])
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for signum in installed:
+            loop.remove_signal_handler(signum)
+
+
+@functools.lru_cache(maxsize=None)
+def _conda_python(env_name):
+    """
+    定位 conda 环境 env_name 中的 python 解释器，直接调用以省去 `conda run` 的额外启动开销。
+    找不到时返回 None，由调用方回退到 `conda run`。
+    """
+    roots = []
+    prefix = os.environ.get("CONDA_PREFIX")
+    if prefix:
+        prefix = os.path.abspath(prefix)
+        # 当前激活的可能是 base，也可能是 envs/ 下的某个环境
+        if os.path.basename(os.path.dirname(prefix)) == "envs":
+            roots.append(os.path.dirname(os.path.dirname(prefix)))
+        roots.append(prefix)
+    conda_exe = os.environ.get("CONDA_EXE")
+    if conda_exe:
+        roots.append(os.path.dirname(os.path.dirname(os.path.abspath(conda_exe))))
+
+    rel = "python.exe" if os.name == "nt" else os.path.join("bin", "python")
+    for base in roots:
+        candidate = os.path.join(base, "envs", env_name, rel)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _env_cmd(env_name, script, *script_args):
+    """
+    构造在 conda 环境 env_name 中运行 script 的命令；找不到解释器时回退到 `conda run`。
+    """
+    env_py = _conda_python(env_name)
+    if env_py:
+        return [env_py, script, *script_args]
+    quoted = " ".join(f"\"{a}\"" for a in (script, *script_args))
+    return f"conda run -n {env_name} --no-capture-output python {quoted}"
 
 
 def _ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
-def _extract_frames(py, video, out_dir, fps=None):
-    cmd = [py, os.path.join("evaluation", "extract_frames.py"), video, out_dir]
+def _extract_frames(video, out_dir, fps=None):
+    """
+    直接调用一次 ffmpeg 抽帧（与 evaluation/extract_frames.py 输出一致），
+    省去额外启动一个 Python 解释器的开销。
+    """
+    _ensure_dir(out_dir)
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-i", video]
     if fps is not None:
-        cmd += ["--fps", str(fps)]
-    _run(cmd, cwd=_project_root())
+        cmd += ["-vf", f"fps={fps}"]
+    cmd += [os.path.join(out_dir, "%06d.png")]
+    _run(cmd)
+
+
+def _frame_cache_key(video, fps=None) -> str:
+    """
+    抽帧缓存键：视频绝对路径 + 修改时间(ns) + fps，任一变化即视为缓存失效。
+    """
+    video_abs = os.path.abspath(video)
+    mtime_ns = os.stat(video_abs).st_mtime_ns
+    raw = f"{video_abs}|{mtime_ns}|{fps}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
 
+def _remove_path(path: str):
+    if os.path.islink(path):
+        os.unlink(path)
+    elif os.path.exists(path):
+        shutil.rmtree(path)
+
+
+def _extract_frames_cached(video, cache_dir, fps=None):
+    """
+    抽帧到缓存目录；目录中存在 .done 标记时直接复用，否则重新抽帧。
+    """
+    done_flag = os.path.join(cache_dir, ".done")
+    if os.path.exists(done_flag):
+        print(f"\n[CACHE] reuse frames for {video}: {cache_dir}")
+        return
+    # 没有 .done 说明上次抽帧未完成，清掉残留后重建
+    _remove_path(cache_dir)
+    _extract_frames(video, cache_dir, fps=fps)
+    with open(done_flag, "w", encoding="utf-8") as f:
+        f.write(os.path.abspath(video))
+
+
+def _link_frames(cache_dir, frames_dir):
+    """
+    让 frames_dir 指向缓存目录；系统不支持符号链接时（如部分 Windows 环境）直接返回缓存目录。
+    """
+    try:
+        os.symlink(os.path.abspath(cache_dir), frames_dir, target_is_directory=True)
+        return frames_dir
+    except OSError:
+        return cache_dir
+
+def _pair_dir_name(pair_id):
+    """pair_id 对应的工作目录名（非法字符替换为 _）。"""
+    return re.sub(r"[^\w.-]", "_", pair_id)
+
+
+def _load_pairs(path, need_gt):
+    """
+    读取 --pairs-file（jsonl），每行形如 {"pair_id": ..., "pred_video": ..., "gt_video": ...}。
+    视频路径相对当前工作目录解析为绝对路径。
+    pair_id 需唯一（替换非法字符后的目录名也需唯一），且不能包含 "]" 或换行，
+    否则无法从评测脚本的 "[pair_id] = 数值" 输出中区分各 pair。
+    """
+    pairs = []
+    dir_owner = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for idx, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if not item.get("pred_video"):
+                raise SystemExit(f"{path}:{idx + 1}: missing 'pred_video'")
+            if need_gt and not item.get("gt_video"):
+                raise SystemExit(f"{path}:{idx + 1}: missing 'gt_video' (required for --fid)")
+            pair_id = str(item.get("pair_id", idx))
+            if not pair_id or "]" in pair_id or "\n" in pair_id or "\r" in pair_id:
+                raise SystemExit(f"{path}:{idx + 1}: invalid pair_id {pair_id!r} (must be non-empty, without ']' or newlines)")
+            dir_name = _pair_dir_name(pair_id)
+            if dir_name in dir_owner:
+                other = dir_owner[dir_name]
+                if other == pair_id:
+                    raise SystemExit(f"{path}:{idx + 1}: duplicate pair_id {pair_id!r}")
+                raise SystemExit(
+                    f"{path}:{idx + 1}: pair_id {pair_id!r} maps to the same work dir {dir_name!r} as {other!r}"
+                )
+            dir_owner[dir_name] = pair_id
+            videos = {}
+            for key in ("pred_video", "gt_video"):
+                if item.get(key):
+                    videos[key] = os.path.abspath(item[key])
+                    if not os.path.isfile(videos[key]):
+                        raise SystemExit(f"{path}:{idx + 1}: {key} not found: {videos[key]}")
+            pairs.append({
+                "pair_id": pair_id,
+                "pred_video": videos["pred_video"],
+                "gt_video": videos.get("gt_video"),
+            })
+    if not pairs:
+        raise SystemExit(f"No pairs found in {path}")
+    return pairs
+
+
+def _stale_cache_entries(jobs, cache_root, keep):
+    """
+    找出各帧目录当前链接到、但本次不再使用的缓存条目
+    （视频重新渲染或 fps 改变后，旧的抽帧结果不会再被命中）。
+    """
+    cache_root = os.path.realpath(cache_root)
+    stale = set()
+    for _, out_dir in jobs:
+        if not os.path.islink(out_dir):
+            continue
+        target = os.path.realpath(out_dir)
+        if os.path.dirname(target) == cache_root and target not in keep:
+            stale.add(target)
+    return stale
+
+
+def _prepare_frames(args, jobs):
+    """
+    并行抽帧，jobs 为 [(video, frames_dir), ...]；返回每个 job 实际可用的帧目录。
+    """
+    # 按 (路径, mtime, fps) 缓存抽帧结果，重复评测时跳过视频解码
+    cache_root = os.path.join(args.work_dir, "cache")
+    cache_dirs = [] if args.no_cache else [
+        os.path.join(cache_root, _frame_cache_key(video, args.fps)) for video, _ in jobs
+    ]
+    stale = _stale_cache_entries(jobs, cache_root, {os.path.realpath(d) for d in cache_dirs})
+
+    # 提前统一清理输出目录（可能是上次留下的缓存链接），避免并行任务之间的先后顺序问题
+    for _, out_dir in jobs:
+        _remove_path(out_dir)
+    # 缓存键已变化的旧条目不会再被复用，随链接一起删除，避免 cache 目录无限增长
+    for path in sorted(stale):
+        print(f"\n[CACHE] remove stale frames: {path}")
+        shutil.rmtree(path, ignore_errors=True)
+
+    if args.no_cache:
+        with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as ex:
+            futures = [ex.submit(_extract_frames, video, out_dir, args.fps) for video, out_dir in jobs]
+            for fut in futures:
+                fut.result()
+        return [out_dir for _, out_dir in jobs]
+
+    # 同一视频出现多次时只抽一次，避免多个任务写同一缓存目录
+    pending = {}
+    for (video, _), cache_dir in zip(jobs, cache_dirs):
+        pending.setdefault(cache_dir, video)
+    with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as ex:
+        futures = [
+            ex.submit(_extract_frames_cached, video, cache_dir, args.fps)
+            for cache_dir, video in pending.items()
+        ]
+        for fut in futures:
+            fut.result()
+
+    return [_link_frames(cache_dir, out_dir) for (_, out_dir), cache_dir in zip(jobs, cache_dirs)]
+
+
+async def _stage_frame(args, py):
+    """PSNR/SSIM（可选 LPIPS）。"""
+    cmd = [
+        py,
+        _FRAME_SCRIPT,
+        args.pred_video,
+        args.gt_video,
+    ]
+    if args.lpips:
+        cmd += ["--lpips", "--lpips-net", args.lpips_net]
+    ret, out = await _run_async(cmd, allow_fail=False)
+
+    psnr_val = None
+    ssim_val = None
+    lpips_val = None
+    if out:
+        m = _RE_PSNR.search(out)
+        if m:
+            psnr_val = float(m.group(1))
+        m = _RE_SSIM.search(out)
+        if m:
+            ssim_val = float(m.group(1))
+        if args.lpips:
+            m = _RE_LPIPS.search(out)
+            if m:
+                lpips_val = float(m.group(1))
+
+    return {
+        "lpips": bool(args.lpips),
+        "lpips_net": args.lpips_net,
+        "PSNR": psnr_val,
+        "SSIM": ssim_val,
+        "LPIPS": lpips_val,
+    }
+
+
+async def _stage_niqe(args, pred_frames_dir):
+    """NIQE（pred 帧目录）。"""
+    # 在专门的 tg_niqe 环境中计算 NIQE（该环境已安装 pyiqa），并解析数值
+    cmd = _env_cmd("tg_niqe", _NIQE_SCRIPT, pred_frames_dir)
+    ret, out = await _run_async(cmd, allow_fail=True)
+
+    niqe_val = None
+    if out:
+        m = _RE_NIQE.search(out)
+        if m:
+            niqe_val = float(m.group(1))
+
+    if ret != 0:
+        print(
+            "[WARN] NIQE failed. Please ensure 'pyiqa' is installed (pip install pyiqa). "
+            "Continuing with remaining metrics.",
+            file=sys.stderr,
+        )
+    return {"frames_dir": pred_frames_dir, "ok": ret == 0, "NIQE": niqe_val}
+
+
+async def _stage_fid(args, pred_frames_dir, gt_frames_dir):
+    """FID（pred/gt 帧目录）。"""
+    # 在专门的 tg_eval 环境中计算 FID（该环境已安装 clean-fid / torch-fidelity），并解析数值
+    cmd = _env_cmd("tg_eval", _FID_SCRIPT, pred_frames_dir, gt_frames_dir, "--backend", args.fid_backend)
+    ret, out = await _run_async(cmd, allow_fail=False)
+
+    fid_val = None
+    if out:
+        m = _RE_FID.search(out)
+        if m:
+            fid_val = float(m.group(1))
+
+    return {
+        "backend": args.fid_backend,
+        "gen_frames": pred_frames_dir,
+        "gt_frames": gt_frames_dir,
+        "FID": fid_val,
+    }
+
+
+async def _stage_niqe_pairs(args, manifest_path, pairs):
+    """NIQE（--pairs-file 批量模式）：一次进程、一次模型加载评测所有 pair。"""
+    cmd = _env_cmd("tg_niqe", _NIQE_SCRIPT, "--manifest", manifest_path)
+    ret, out = await _run_async(cmd, allow_fail=True)
+
+    scores = {pair_id: float(val) for pair_id, val in _RE_NIQE_PAIR.findall(out)}
+    if ret != 0:
+        print(
+            "[WARN] NIQE failed. Please ensure 'pyiqa' is installed (pip install pyiqa). "
+            "Continuing with remaining metrics.",
+            file=sys.stderr,
+        )
+    return {
+        "ok": ret == 0,
+        "pairs": {
+            p["pair_id"]: {"frames_dir": p["pred_dir"], "NIQE": scores.get(p["pair_id"])}
+            for p in pairs
+        },
+    }
+
+
+async def _stage_fid_pairs(args, manifest_path, pairs):
+    """FID（--pairs-file 批量模式）：一次进程、一次 Inception 加载评测所有 pair。"""
+    cmd = _env_cmd("tg_eval", _FID_SCRIPT, "--manifest", manifest_path, "--backend", args.fid_backend)
+    ret, out = await _run_async(cmd, allow_fail=False)
+
+    scores = {pair_id: float(val) for pair_id, val in _RE_FID_PAIR.findall(out)}
+    return {
+        "backend": args.fid_backend,
+        "pairs": {
+            p["pair_id"]: {"gen_frames": p["pred_dir"], "gt_frames": p["gt_dir"], "FID": scores.get(p["pair_id"])}
+            for p in pairs
+        },
+    }
+
+
+async def _stage_lse(args, py):
+    """LSE-C/LSE-D（SyncNet）。"""
+    if args.setup_lse:
+        await _run_async(["bash", _SETUP_LSE_SCRIPT], cwd=_ROOT)
+
+    cmd = [
+        py,
+        _LSE_SCRIPT,
+        args.gen_videos_dir,
+        "--preset",
+        args.lse_preset,
+        "--syncnet-dir",
+        args.syncnet_dir,
+        "--tmp-dir",
+        args.tmp_dir,
+    ]
+    ret, out = await _run_async(cmd, allow_fail=True)
+
+    lse_c = None
+    lse_d = None
+
+    # 优先从标准输出里解析
+    if out:
+        m = _RE_LSE_C.search(out)
+        if m:
+            lse_c = float(m.group(1))
+        m = _RE_LSE_D.search(out)
+        if m:
+            lse_d = float(m.group(1))
+
+    # 其次从 SyncNet 输出的 all_scores.txt 中解析（如果存在）
+    scores_path = os.path.join(args.syncnet_dir, "all_scores.txt")
+    if (lse_c is None or lse_d is None) and os.path.exists(scores_path):
+        # mmap 后直接用字节正则查找，只解码捕获到的数值
+        with open(scores_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if lse_c is None:
+                        m = _RE_LSE_C_BYTES.search(mm)
+                        if m:
+                            lse_c = float(m.group(1).decode("ascii"))
+                    if lse_d is None:
+                        m = _RE_LSE_D_BYTES.search(mm)
+                        if m:
+                            lse_d = float(m.group(1).decode("ascii"))
+
+    return {
+        "preset": args.lse_preset,
+        "gen_videos_dir": args.gen_videos_dir,
+        "syncnet_dir": args.syncnet_dir,
+        "LSE-C": lse_c,
+        "LSE-D": lse_d,
+    }
+
 def main():
     parser = argparse.ArgumentParser(
         description=(
@@ -64,6 +587,14 @@ def main():
     # Inputs
     parser.add_argument("--pred-video", default=None, help="Pred/generated video path (for PSNR/SSIM/LPIPS, NIQE, FID)")
     parser.add_argument("--gt-video", default=None, help="GT/reference video path (for PSNR/SSIM/LPIPS, FID)")
+    parser.add_argument(
+        "--pairs-file",
+        default=None,
+        help=(
+            "jsonl with one {pair_id, pred_video, gt_video} per line; runs NIQE/FID for all pairs "
+            "with a single model load (replaces --pred-video/--gt-video for NIQE/FID)"
+        ),
+    )
     parser.add_argument(
         "--gen-videos-dir",
         default=None,
@@ -115,7 +646,7 @@ def main():
     )
     parser.add_argument(
         "--syncnet-dir",
-        default=os.path.join(_project_root(), "third_party", "syncnet_python"),
+        default=os.path.join(_ROOT, "third_party", "syncnet_python"),
         help="Path to syncnet_python repo (for LSE)",
     )
     parser.add_argument(
@@ -132,9 +663,19 @@ def main():
     # Output
     parser.add_argument(
         "--work-dir",
-        default=os.path.join(_project_root(), "evaluation", "_work"),
+        default=os.path.join(_EVAL_DIR, "_work"),
         help="Working directory for extracted frames",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the frame cache under <work-dir>/cache and re-extract frames from the videos",
+    )
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="Run the metric stages one after another instead of in parallel (for debugging)",
+    )
     parser.add_argument(
         "--json-out",
         default=None,
@@ -152,167 +693,97 @@ def main():
     if args.all or (not (run_frame or run_niqe or run_fid or run_lse)):
         # If --all OR nothing specified: run whatever makes sense with inputs
         run_frame = args.pred_video is not None and args.gt_video is not None
-        run_niqe = args.pred_video is not None
-        run_fid = args.pred_video is not None and args.gt_video is not None
+        run_niqe = args.pred_video is not None or args.pairs_file is not None
+        run_fid = (args.pred_video is not None and args.gt_video is not None) or args.pairs_file is not None
         run_lse = args.gen_videos_dir is not None
 
-    root = _project_root()
     py = sys.executable
 
     results = {}
     _ensure_dir(args.work_dir)
 
-    # 1) Frame metrics
-    if run_frame:
-        if not args.pred_video or not args.gt_video:
-            raise SystemExit("--frame requires --pred-video and --gt-video")
-        cmd = [
-            py,
-            os.path.join(root, "evaluation", "eval_frame_metrics.py"),
-            args.pred_video,
-            args.gt_video,
-        ]
-        if args.lpips:
-            cmd += ["--lpips", "--lpips-net", args.lpips_net]
-        ret, out = _run_with_output(cmd, allow_fail=False)
-
-        psnr_val = None
-        ssim_val = None
-        lpips_val = None
-        if out:
-            m = re.search(r"PSNR\s*=\s*([0-9.+-eE]+)", out)
-            if m:
-                psnr_val = float(m.group(1))
-            m = re.search(r"SSIM\s*=\s*([0-9.+-eE]+)", out)
-            if m:
-                ssim_val = float(m.group(1))
-            if args.lpips:
-                m = re.search(r"LPIPS.*?=\s*([0-9.+-eE]+)", out)
-                if m:
-                    lpips_val = float(m.group(1))
-
-        results["frame"] = {
-            "lpips": bool(args.lpips),
-            "lpips_net": args.lpips_net,
-            "PSNR": psnr_val,
-            "SSIM": ssim_val,
-            "LPIPS": lpips_val,
-        }
-
-    # 2) NIQE (extract frames from pred)
-    pred_frames_dir = None
-    if run_niqe or run_fid:
-        if not args.pred_video:
+    # 视频统一解析为绝对路径（相对当前工作目录），缓存键、ffmpeg 与各评测脚本读取的是同一个文件
+    if args.pred_video:
+        args.pred_video = os.path.abspath(args.pred_video)
+    if args.gt_video:
+        args.gt_video = os.path.abspath(args.gt_video)
+
+    # 先检查输入，避免并行阶段启动后才报错
+    for flag, video in (("--pred-video", args.pred_video), ("--gt-video", args.gt_video)):
+        if video and not os.path.isfile(video):
+            raise SystemExit(f"{flag} not found: {video}")
+    if run_frame and (not args.pred_video or not args.gt_video):
+        raise SystemExit("--frame requires --pred-video and --gt-video")
+    pairs = None
+    if args.pairs_file:
+        if run_niqe or run_fid:
+            pairs = _load_pairs(args.pairs_file, need_gt=run_fid)
+    else:
+        if (run_niqe or run_fid) and not args.pred_video:
             raise SystemExit("--niqe/--fid require --pred-video")
-        pred_frames_dir = os.path.join(args.work_dir, "pred_frames")
-        if os.path.exists(pred_frames_dir):
-            shutil.rmtree(pred_frames_dir)
-        _extract_frames(py, args.pred_video, pred_frames_dir, fps=args.fps)
-
-    if run_niqe:
-        # 在专门的 tg_niqe 环境中计算 NIQE（该环境已安装 pyiqa），并解析数值
-        niqe_script = os.path.join(root, "evaluation", "eval_niqe.py")
-        cmd = f"conda run -n tg_niqe --no-capture-output python \"{niqe_script}\" \"{pred_frames_dir}\""
-        ret, out = _run_with_output(cmd, allow_fail=True)
-
-        niqe_val = None
-        if out:
-            m = re.search(r"NIQE\s*\(pyiqa\)\s*=\s*([0-9.+-eE]+)", out)
-            if m:
-                niqe_val = float(m.group(1))
-
-        results["niqe"] = {"frames_dir": pred_frames_dir, "ok": ret == 0, "NIQE": niqe_val}
-        if ret != 0:
-            print(
-                "[WARN] NIQE failed. Please ensure 'pyiqa' is installed (pip install pyiqa). "
-                "Continuing with remaining metrics.",
-                file=sys.stderr,
-            )
-
-    # 3) FID (extract frames for gt too)
-    if run_fid:
-        if not args.gt_video:
+        if run_fid and not args.gt_video:
             raise SystemExit("--fid requires --gt-video")
-        gt_frames_dir = os.path.join(args.work_dir, "gt_frames")
-        if os.path.exists(gt_frames_dir):
-            shutil.rmtree(gt_frames_dir)
-        _extract_frames(py, args.gt_video, gt_frames_dir, fps=args.fps)
-
-        # 在专门的 tg_eval 环境中计算 FID（该环境已安装 clean-fid / torch-fidelity），并解析数值
-        fid_script = os.path.join(root, "evaluation", "eval_fid.py")
-        cmd = (
-            "conda run -n tg_eval --no-capture-output python "
-            f"\"{fid_script}\" \"{pred_frames_dir}\" \"{gt_frames_dir}\" "
-            f"--backend {args.fid_backend}"
-        )
-        ret, out = _run_with_output(cmd, allow_fail=False)
-
-        fid_val = None
-        if out:
-            m = re.search(r"FID.*?=\s*([0-9.+-eE]+)", out)
-            if m:
-                fid_val = float(m.group(1))
+    if run_lse and not args.gen_videos_dir:
+        raise SystemExit("--lse requires --gen-videos-dir")
 
-        results["fid"] = {
-            "backend": args.fid_backend,
-            "gen_frames": pred_frames_dir,
-            "gt_frames": gt_frames_dir,
-            "FID": fid_val,
-        }
-
-    # 4) LSE
+    # 1) 抽帧：各视频互不依赖，ffmpeg 任务并行执行
+    pred_frames_dir = None
+    gt_frames_dir = None
+    manifest_path = None
+    if pairs is not None:
+        jobs = []
+        for p in pairs:
+            pair_dir = os.path.join(args.work_dir, "pairs", _pair_dir_name(p["pair_id"]))
+            jobs.append((p["pred_video"], os.path.join(pair_dir, "pred_frames")))
+            if run_fid:
+                jobs.append((p["gt_video"], os.path.join(pair_dir, "gt_frames")))
+            _ensure_dir(pair_dir)
+        frames_dirs = iter(_prepare_frames(args, jobs))
+        for p in pairs:
+            p["pred_dir"] = next(frames_dirs)
+            p["gt_dir"] = next(frames_dirs) if run_fid else None
+
+        # NIQE/FID 共用一份帧目录清单，各自只启动一次评测进程
+        fd, manifest_path = tempfile.mkstemp(prefix="pairs_", suffix=".jsonl", dir=args.work_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for p in pairs:
+                f.write(json.dumps(
+                    {"pair_id": p["pair_id"], "pred_dir": p["pred_dir"], "gt_dir": p["gt_dir"]},
+                    ensure_ascii=False,
+                ) + "\n")
+    elif run_niqe or run_fid:
+        pred_frames_dir = os.path.join(args.work_dir, "pred_frames")
+        jobs = [(args.pred_video, pred_frames_dir)]
+        if run_fid:
+            gt_frames_dir = os.path.join(args.work_dir, "gt_frames")
+            jobs.append((args.gt_video, gt_frames_dir))
+        frames_dirs = _prepare_frames(args, jobs)
+        pred_frames_dir = frames_dirs[0]
+        if run_fid:
+            gt_frames_dir = frames_dirs[1]
+
+    # 2) 各指标阶段互不依赖（NIQE/FID 只读取上面抽好的帧），默认在事件循环中并发执行
+    stages = []
+    if run_frame:
+        stages.append(("frame", lambda: _stage_frame(args, py)))
+    if run_niqe and pairs is not None:
+        stages.append(("niqe", lambda: _stage_niqe_pairs(args, manifest_path, pairs)))
+    elif run_niqe:
+        stages.append(("niqe", lambda: _stage_niqe(args, pred_frames_dir)))
+    if run_fid and pairs is not None:
+        stages.append(("fid", lambda: _stage_fid_pairs(args, manifest_path, pairs)))
+    elif run_fid:
+        stages.append(("fid", lambda: _stage_fid(args, pred_frames_dir, gt_frames_dir)))
     if run_lse:
-        if not args.gen_videos_dir:
-            raise SystemExit("--lse requires --gen-videos-dir")
-        if args.setup_lse:
-            _run(["bash", os.path.join(root, "evaluation", "setup_lse.sh")], cwd=root)
-
-        cmd = [
-            py,
-            os.path.join(root, "evaluation", "eval_lse.py"),
-            args.gen_videos_dir,
-            "--preset",
-            args.lse_preset,
-            "--syncnet-dir",
-            args.syncnet_dir,
-            "--tmp-dir",
-            args.tmp_dir,
-        ]
-        ret, out = _run_with_output(cmd, allow_fail=True)
-
-        lse_c = None
-        lse_d = None
-
-        # 优先从标准输出里解析
-        if out:
-            m = re.search(r"LSE-C.*?=\s*([0-9.+-eE]+)", out)
-            if m:
-                lse_c = float(m.group(1))
-            m = re.search(r"LSE-D.*?=\s*([0-9.+-eE]+)", out)
-            if m:
-                lse_d = float(m.group(1))
-
-        # 其次从 SyncNet 输出的 all_scores.txt 中解析（如果存在）
-        scores_path = os.path.join(args.syncnet_dir, "all_scores.txt")
-        if (lse_c is None or lse_d is None) and os.path.exists(scores_path):
-            with open(scores_path, "r", encoding="utf-8") as f:
-                text = f.read()
-            if lse_c is None:
-                m = re.search(r"LSE-C.*?=\s*([0-9.+-eE]+)", text)
-                if m:
-                    lse_c = float(m.group(1))
-            if lse_d is None:
-                m = re.search(r"LSE-D.*?=\s*([0-9.+-eE]+)", text)
-                if m:
-                    lse_d = float(m.group(1))
-
-        results["lse"] = {
-            "preset": args.lse_preset,
-            "gen_videos_dir": args.gen_videos_dir,
-            "syncnet_dir": args.syncnet_dir,
-            "LSE-C": lse_c,
-            "LSE-D": lse_d,
-        }
+        stages.append(("lse", lambda: _stage_lse(args, py)))
+
+    try:
+        results.update(asyncio.run(_run_stages(stages, serial=args.serial)))
+    except subprocess.CalledProcessError as e:
+        raise SystemExit(e.returncode)
+    finally:
+        if manifest_path and os.path.exists(manifest_path):
+            os.remove(manifest_path)
 
     if args.json_out:
         _ensure_dir(os.path.dirname(os.path.abspath(args.json_out)) or ".")
@@ -1,12 +1,113 @@
 from flask import Flask, render_template, request, jsonify
+from werkzeug.datastructures import CombinedMultiDict, MultiDict
+from werkzeug.exceptions import RequestEntityTooLarge
+from concurrent.futures import Future
+import hashlib
+import json
 import os
+import secrets
+import shutil
 import threading
+import time
 from backend.video_generator import generate_video
 from backend.model_trainer import train_model
 from backend.chat_engine import chat_response
 
 app = Flask(__name__)
 
+# 音频上传大小上限（MB）：作为全局请求体上限，由 Werkzeug 在读取请求体时强制执行
+# （包括未带 Content-Length 的分块上传），超限返回 413
+MAX_AUDIO_UPLOAD_BYTES = int(os.getenv('MAX_AUDIO_UPLOAD_MB', '200')) * 1024 * 1024
+app.config['MAX_CONTENT_LENGTH'] = MAX_AUDIO_UPLOAD_BYTES
+# 写入上传文件时每次拷贝的块大小
+UPLOAD_COPY_CHUNK = 1024 * 1024
+# 语音克隆参考音频允许的扩展名
+_ALLOWED_AUDIO_EXTS = frozenset({'.wav', '.mp3', '.m4a', '.flac'})
+
+# 各接口转交给后端的表单字段（白名单）；其余字段（如 dataset_path、audio_extractor）
+# 会被后端直接拼进子进程参数，不接受客户端传入，始终使用服务端默认值
+VIDEO_FORM_FIELDS = ('model_name', 'model_param', 'ref_audio', 'gpu_choice', 'target_text')
+TRAIN_FORM_FIELDS = ('model_choice', 'ref_video', 'gpu_choice', 'epoch', 'custom_params')
+CHAT_FORM_FIELDS = (
+    'model_name', 'model_param', 'api_choice',
+    # 语音克隆：voice_clone_type（current_recording / preset_voice / custom）及其参数
+    'voice_clone_type', 'preset_voice_name', 'custom_voice_file', 'custom_voice_path',
+    'voice_clone',  # 兼容旧前端
+)
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    """请求体超过 MAX_CONTENT_LENGTH 时，按前端约定的 JSON 格式返回错误"""
+    return jsonify({'status': 'error', 'message': f'音频文件过大，最大支持 {MAX_AUDIO_UPLOAD_BYTES // (1024 * 1024)} MB'}), 413
+
+
+def _form_subset(fields):
+    """只保留 request.form 中白名单内的字段（未提交的字段保持缺省，由后端给默认值）"""
+    return MultiDict([(key, value) for key in fields for value in request.form.getlist(key)])
+
+
+def _save_upload(file_storage, filepath):
+    """分块写入上传文件，内存中只保留一个拷贝缓冲区"""
+    with open(filepath, 'wb') as dst:
+        shutil.copyfileobj(file_storage.stream, dst, UPLOAD_COPY_CHUNK)
+
+
+# 进行中的视频生成：{请求指纹: Future}，相同请求并发到达时只生成一次
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _file_stamp(path):
+    """文件的 (mtime_ns, size)，不存在时返回 None"""
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _video_request_key(data, inference_params):
+    """
+    计算视频生成请求的指纹：表单字段 + 推理参数 + 参考音频的 mtime/大小。
+    参考音频常是固定路径（如 static/audios/input.wav），重新录音后指纹随之变化。
+    """
+    payload = {
+        "form": data.to_dict(flat=False),
+        "inference_params": inference_params,
+        "ref_audio_stamp": _file_stamp(data.get('ref_audio')),
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _generate_video_once(data, key):
+    """
+    合并同时到达的相同视频生成请求：相同请求正在生成时等待其结果；
+    否则由当前请求线程执行 generate_video 并把结果共享给等待者。
+    生成结束即移出 _inflight，之后的重复请求会重新生成。
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+
+    if not owner:
+        print("[app] 相同的视频生成请求正在进行，等待其结果")
+        return future.result()
+
+    try:
+        video_path = generate_video(data)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(video_path)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+    return video_path
+
 
 # 首页
 @app.route('/')
@@ -31,16 +132,14 @@ def video_generation():
             except ValueError:
                 print(f"[app] 警告：sh_degree={sh_degree} 不是有效整数，使用默认值")
 
-        data = {
-            "model_name": request.form.get('model_name'),
-            "model_param": request.form.get('model_param'),
-            "ref_audio": request.form.get('ref_audio'),
-            "gpu_choice": request.form.get('gpu_choice'),
-            "target_text": request.form.get('target_text'),
-            "inference_params": inference_params if inference_params else {}  # 方案二：渲染细节等级
-        }
+        # 白名单内的表单字段（后端按需 .get 并在使用处给默认值），叠加需要预处理的参数
+        form = _form_subset(VIDEO_FORM_FIELDS)
+        data = CombinedMultiDict([
+            MultiDict({"inference_params": inference_params}),  # 方案二：渲染细节等级
+            form,
+        ])
 
-        video_path = generate_video(data)
+        video_path = _generate_video_once(data, _video_request_key(form, inference_params))
         return jsonify({'status': 'success', 'video_path': video_path})
 
     return render_template('video_generation.html')
@@ -84,16 +183,9 @@ def train_model_async(data, task_id):
 @app.route('/model_training', methods=['GET', 'POST'])
 def model_training():
     if request.method == 'POST':
-        data = {
-            "model_choice": request.form.get('model_choice'),
-            "ref_video": request.form.get('ref_video'),
-            "gpu_choice": request.form.get('gpu_choice'),
-            "epoch": request.form.get('epoch'),
-            "custom_params": request.form.get('custom_params')
-        }
+        data = _form_subset(TRAIN_FORM_FIELDS)
 
         # 生成任务ID
-        import time
         task_id = f"train_{int(time.time())}"
 
         # 启动异步训练任务
@@ -158,22 +250,14 @@ def chat_system():
             except ValueError:
                 print(f"[app] 警告：sh_degree={sh_degree} 不是有效整数，使用默认值")
 
-        data = {
-            "model_name": request.form.get('model_name'),
-            "model_param": request.form.get('model_param'),
-            # 新的语音克隆参数格式
-            "voice_clone_type": request.form.get('voice_clone_type'),  # current_recording / preset_voice / custom
-            "preset_voice_name": request.form.get('preset_voice_name'),  # 预设音色名称
-            "custom_voice_file": request.form.get('custom_voice_file'),  # 自定义音频文件名（上传后返回的文件名）
-            "custom_voice_path": request.form.get('custom_voice_path'),  # 自定义音频完整路径（手动输入）
-            # 保留旧参数以兼容（如果前端还未更新）
-            "voice_clone": request.form.get('voice_clone'),
-            "api_choice": request.form.get('api_choice'),
-            # CosyVoice 参数
-            "cosyvoice_params": cosyvoice_params,  # 语言类型选择
-            # TalkingGaussian 推理参数
-            "inference_params": inference_params if inference_params else {}  # 方案二：渲染细节等级
-        }
+        # 白名单内的表单字段，叠加需要预处理的参数
+        data = CombinedMultiDict([
+            MultiDict({
+                "cosyvoice_params": cosyvoice_params,  # 语言类型选择
+                "inference_params": inference_params,  # TalkingGaussian 推理参数（方案二：渲染细节等级）
+            }),
+            _form_subset(CHAT_FORM_FIELDS),
+        ])
 
         video_path = chat_response(data)
         video_path = "/" + video_path.replace("\\", "/")
@@ -197,13 +281,11 @@ def save_audio():
 
     # 保存文件（固定名称，供后续流程使用）
     input_path = './static/audios/input.wav'
-    audio_file.save(input_path)
+    _save_upload(audio_file, input_path)
 
     # 同时保存一个带时间戳的副本（用于历史记录）
-    import time
     timestamp = time.strftime('%Y%m%d_%H%M%S')
     timestamped_path = f'./static/audios/input_{timestamp}.wav'
-    import shutil
     shutil.copy(input_path, timestamped_path)
 
     return jsonify({
@@ -227,22 +309,21 @@ def upload_voice_clone():
         return jsonify({'status': 'error', 'message': '没有选择文件'})
 
     # 检查文件扩展名
-    if not audio_file.filename.lower().endswith(('.wav', '.mp3', '.m4a', '.flac')):
+    file_ext = os.path.splitext(audio_file.filename)[1].lower()
+    if file_ext not in _ALLOWED_AUDIO_EXTS:
         return jsonify({'status': 'error', 'message': '不支持的音频格式，请上传 .wav, .mp3, .m4a 或 .flac 文件'})
 
     # 确保自定义音频目录存在
     custom_voice_dir = './static/audios/custom_voice'
     os.makedirs(custom_voice_dir, exist_ok=True)
 
-    # 生成唯一文件名（使用时间戳避免覆盖）
-    import time
-    timestamp = int(time.time())
-    file_ext = os.path.splitext(audio_file.filename)[1]
-    filename = f"custom_voice_{timestamp}{file_ext}"
+    # 生成唯一文件名（时间戳 + 随机后缀，避免同一秒内的上传互相覆盖）
+    timestamp = time.time_ns() // 1_000_000_000
+    filename = f"custom_voice_{timestamp}_{secrets.token_hex(4)}{file_ext}"
     filepath = os.path.join(custom_voice_dir, filename)
 
     # 保存文件
-    audio_file.save(filepath)
+    _save_upload(audio_file, filepath)
 
     return jsonify({
         'status': 'success',
@@ -293,5 +374,18 @@ def upload_au():
 
 if __name__ == '__main__':
     # host='0.0.0.0' 允许从外部访问（华为云服务器需要）
-    # debug=True 开发模式，生产环境应设置为False
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    host, port = '0.0.0.0', 5001
+    if os.getenv('APP_DEBUG', '').lower() in ('1', 'true', 'yes'):
+        # 开发模式：Werkzeug 开发服务器（自动重载 + 调试器）
+        app.run(debug=True, host=host, port=port)
+    else:
+        # 生产模式：多线程 WSGI 服务器，避免一个长时间的视频生成请求阻塞其它接口
+        threads = int(os.getenv('APP_THREADS', '8'))
+        try:
+            from waitress import serve
+        except ImportError:
+            print("[app] 未安装 waitress（pip install waitress），回退到 Flask 内置多线程服务器")
+            app.run(debug=False, host=host, port=port, threaded=True)
+        else:
+            print(f"[app] 使用 waitress 启动: http://{host}:{port} (threads={threads})")
+            serve(app, host=host, port=port, threads=threads)
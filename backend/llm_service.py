@@ -1,6 +1,8 @@
 from openai import OpenAI
+import functools
 import os
 import json
+from types import MappingProxyType, SimpleNamespace
 
 # === API 配置文件路径 ===
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), 'config')
@@ -58,8 +60,44 @@ def load_api_config():
     
     return api_config
 
+def _config_mtime():
+    try:
+        return os.stat(CONFIG_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+@functools.lru_cache(maxsize=1)
+def _frozen_config(config_mtime):
+    """
+    只读的 API 配置：{名称: SimpleNamespace(api_key, base_url, model, enabled)}
+    以配置文件 mtime 为缓存键，文件未修改时不再重复读取和解析
+    """
+    return MappingProxyType({k: SimpleNamespace(**v) for k, v in load_api_config().items()})
+
+def get_api_config():
+    """获取当前 API 配置（配置文件被修改后自动重新加载）"""
+    return _frozen_config(_config_mtime())
+
 # 加载API配置
-API_CONFIG = load_api_config()
+API_CONFIG = get_api_config()
+
+# 配置模板中的占位密钥，视为未配置
+DEFAULT_API_KEYS = frozenset({"sk-xxxxxxxx", "your-zhipu-api-key-here", "sk-your-deepseek-api-key-here"})
+
+# 数字人助手的系统消息（每次调用直接复用，不再重复构造）
+SYSTEM_MESSAGE = {"role": "system", "content": "你是一个数字人助手，请用简短、口语化的中文回答用户，字数控制在50字以内。"}
+# 回复长度上限：50 字中文约 100 token 以内，留出少量余量即可
+MAX_REPLY_TOKENS = 96
+# 遇到段落分隔即停止生成，避免超出口播长度的长篇回复
+STOP_SEQUENCES = ["\n\n"]
+
+@functools.lru_cache(maxsize=8)
+def _get_client(api_key, base_url):
+    """
+    按 (api_key, base_url) 缓存 OpenAI 客户端，复用底层 HTTP 连接池，
+    避免每轮对话都重新建立 TLS 连接。配置变更后会自然生成新的客户端。
+    """
+    return OpenAI(api_key=api_key, base_url=base_url)
 
 def query_llm(text, api_choice="zhipu"):
     """
@@ -67,18 +105,18 @@ def query_llm(text, api_choice="zhipu"):
     """
     print(f"[LLM Service] 正在调用: {api_choice}")
     
-    # 重新加载配置（支持动态更新）
+    # 重新加载配置（支持动态更新，配置文件未修改时直接复用缓存）
     global API_CONFIG
-    API_CONFIG = load_api_config()
+    API_CONFIG = get_api_config()
     
     config = API_CONFIG.get(api_choice)
-    if not config:
+    if config is None:
         print(f"[LLM Service] 未找到 {api_choice} 配置，回退到 zhipu")
         api_choice = "zhipu"
-        config = API_CONFIG.get("zhipu")
+        config = API_CONFIG["zhipu"]
     
     # 检查API是否启用
-    if not config.get("enabled", True):
+    if not config.enabled:
         print(f"[LLM Service] {api_choice} API未启用，尝试使用其他可用API")
         # 按优先级顺序尝试：deepseek > openai > zhipu
         fallback_order = ["deepseek", "openai", "zhipu"]
@@ -86,38 +124,29 @@ def query_llm(text, api_choice="zhipu"):
             if key == api_choice:
                 continue
             cfg = API_CONFIG.get(key)
-            if cfg and cfg.get("enabled", True):
+            if cfg is not None and cfg.enabled:
                 # 检查密钥是否有效
-                api_key = cfg.get("api_key", "")
-                default_keys = ["sk-xxxxxxxx", "your-zhipu-api-key-here", "sk-your-deepseek-api-key-here"]
-                if api_key and api_key not in default_keys:
+                if cfg.api_key and cfg.api_key not in DEFAULT_API_KEYS:
                     print(f"[LLM Service] 切换到: {key}")
                     config = cfg
                     api_choice = key
                     break
     
     # 检查API密钥是否有效（排除默认占位符）
-    default_keys = ["sk-xxxxxxxx", "your-zhipu-api-key-here", "sk-your-deepseek-api-key-here"]
-    api_key = config.get("api_key", "")
-    if not api_key or api_key in default_keys:
+    if not config.api_key or config.api_key in DEFAULT_API_KEYS:
         print(f"[LLM Service] 警告: {api_choice} 的API密钥未配置或使用默认值")
         return "抱歉，API密钥未配置，请检查配置文件 backend/config/api_config.json 或环境变量。"
 
     try:
         # 使用 OpenAI SDK 统一调用 (智谱、DeepSeek 等现在都兼容此格式)
-        client = OpenAI(
-            api_key=config['api_key'],
-            base_url=config['base_url']
-        )
+        client = _get_client(config.api_key, config.base_url)
 
         response = client.chat.completions.create(
-            model=config['model'],
-            messages=[
-                {"role": "system", "content": "你是一个数字人助手，请用简短、口语化的中文回答用户，字数控制在50字以内。"},
-                {"role": "user", "content": text}
-            ],
+            model=config.model,
+            messages=[SYSTEM_MESSAGE, {"role": "user", "content": text}],
             temperature=0.7,
-            max_tokens=150
+            max_tokens=MAX_REPLY_TOKENS,
+            stop=STOP_SEQUENCES
         )
         
         reply = response.choices[0].message.content
@@ -50,15 +50,15 @@ def train_model(data):
     for k, v in data.items():
         print(f"  {k}: {v}")
     
-    video_path = data['ref_video']
+    video_path = data.get('ref_video')
     print(f"输入视频：{video_path}")
 
     print("[backend.model_trainer] 模型训练中...")
 
-    if data['model_choice'] == "TalkingGaussian":
+    if data.get('model_choice') == "TalkingGaussian":
         try:
             # 获取参数
-            video_path = data['ref_video']
+            video_path = data.get('ref_video')
             gpu_choice = data.get('gpu_choice', 'GPU0')
             epochs = data.get('epoch', '1000')
             audio_extractor = data.get('audio_extractor', 'deepspeech')
@@ -291,14 +291,14 @@ def train_model(data):
             traceback.print_exc()
             return _resp("error", None, f"未知错误: {e}")
     
-    elif data['model_choice'] == "SyncTalk":
+    elif data.get('model_choice') == "SyncTalk":
         try:
             # 构建命令
             cmd = [
                 "./SyncTalk/run_synctalk.sh", "train",
-                "--video_path", data['ref_video'],
-                "--gpu", data['gpu_choice'],
-                "--epochs", data['epoch']
+                "--video_path", data.get('ref_video'),
+                "--gpu", data.get('gpu_choice', 'GPU0'),
+                "--epochs", data.get('epoch', '1000')
             ]
             
             print(f"[backend.model_trainer] 执行命令: {' '.join(cmd)}")
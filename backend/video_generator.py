@@ -80,11 +80,11 @@ def generate_video(data):
     for k, v in data.items():
         print(f"  {k}: {v}")
 
-    if data['model_name'] == "TalkingGaussian":
+    if data.get('model_name') == "TalkingGaussian":
         try:
             # 获取参数
-            audio_path = data['ref_audio']
-            model_path_raw = data['model_param']  # 可能是各种格式
+            audio_path = data.get('ref_audio')
+            model_path_raw = data.get('model_param')  # 可能是各种格式
             dataset_path_raw = data.get('dataset_path', 'TalkingGaussian/data/May')  # 默认数据目录
             audio_extractor = data.get('audio_extractor', 'deepspeech')  # deepspeech 或 hubert
             gpu_choice = data.get('gpu_choice', 'GPU0')
@@ -210,15 +210,15 @@ def generate_video(data):
             traceback.print_exc()
             return os.path.join("static", "videos", "out.mp4")
     
-    elif data['model_name'] == "SyncTalk":
+    elif data.get('model_name') == "SyncTalk":
         try:
             
             # 构建命令
             cmd = [
                 './SyncTalk/run_synctalk.sh', 'infer',
-                '--model_dir', data['model_param'],
-                '--audio_path', data['ref_audio'],
-                '--gpu', data['gpu_choice']
+                '--model_dir', data.get('model_param'),
+                '--audio_path', data.get('ref_audio'),
+                '--gpu', data.get('gpu_choice', 'GPU0')
             ]
 
             print(f"[backend.video_generator] 执行命令: {' '.join(cmd)}")
@@ -236,9 +236,9 @@ def generate_video(data):
                 print("命令标准错误:", result.stderr)
             
             # 文件原路径与目的路径 
-            model_dir_name = os.path.basename(data['model_param'])
+            model_dir_name = os.path.basename(data.get('model_param'))
             source_path = os.path.join("SyncTalk", "model", model_dir_name, "results", "test_audio.mp4")
-            audio_name = os.path.splitext(os.path.basename(data['ref_audio']))[0]
+            audio_name = os.path.splitext(os.path.basename(data.get('ref_audio')))[0]
             video_filename = f"{model_dir_name}_{audio_name}.mp4"
             destination_path = os.path.join("static", "videos", video_filename)
             # 检查文件是否存在